@@ -18,17 +18,324 @@ Features:
     - Debug mode for detailed output
 """
 
+import os
 import re
+import sys
 import argparse
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Match, Sequence, Tuple, Optional
 from dataclasses import dataclass
 
+# Anchor generation (GitHub style): everything except word characters,
+# whitespace, hyphens and colons is dropped. \w already covers accented
+# letters, and backticks, asterisks and dots fall outside the class.
+_ANCHOR_DROP = re.compile(r"[^\w\s\-:]+")
+
+# Kebab-case filenames
+_KEBAB_STRIP = re.compile(r"[^\w\s-]")
+_KEBAB_DASH = re.compile(r"[\s-]+")
+
+# Candidate lines for section analysis: code fences and "## " headers,
+# optionally indented. Scans over whole texts find lines through their leading
+# newline: a pattern that starts with a literal lets the regex engine jump
+# between newlines with a fast search, where a multiline "^" makes it try a
+# match at every position. The first line has no newline and is checked on
+# its own.
+_SECTION_LINE = re.compile(r"[^\S\n]*(?:```|## )[^\n]*")
+_SECTION_SCAN = re.compile(r"\n" + _SECTION_LINE.pattern)
+
+# Header lines ("### Title"): hashes and text of a single line, and the same
+# after a newline for scanning a whole section
+_HEADER_LINE = re.compile(r"^(#{1,6}) (.*)", re.MULTILINE)
+_HEADER_SCAN = re.compile(r"\n(#{1,6}) (.*)")
+
+# Section content: the section's own title line
+_SECTION_TITLE_LINE = re.compile(r"^## .*\n?", re.MULTILINE)
+
+# TOC detection
+_TOC_BULLET_LINK = re.compile(r"^\s*[-*]\s+\[.*\]\(.*\)")
+_TOC_BULLET_ALPHA = re.compile(r"^\s*[-*]\s+[A-Za-z]")
+
+# Line boundaries in the raw source
+_NEWLINE = re.compile(r"\n")
+
+# Markdown links: [text](url)
+_LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+
+# Split quality validation: internal links ([text](#anchor)) and numbered
+# section titles
+_INTERNAL_LINK = re.compile(r"\[([^\]]+)\]\(#([^)]+)\)")
+_NUMBER_PREFIX = re.compile(r"^(\d+)\.")
+
+# Number of lines joined per write when streaming output files, and the
+# buffer size used for output files so chunks reach the disk in few syscalls
+_WRITE_CHUNK_LINES = 1024
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Prompts file blocks. Each block ends with a newline and blocks are joined
+# with a blank line; "{files}" and "{links}" take "- item\n" lines.
+_PROMPT_HEADER_TMPL = """\
+# Recommended Prompts for Post-Processing
+
+This file contains ready-to-use prompts for LLMs to help with post-processing
+the split markdown files. Copy and paste these prompts into your preferred LLM.
+
+**Split Summary:**
+- Total sections: {total}
+- Broken links detected: {broken}
+- Contains code blocks: {has_code_blocks}
+- Contains images: {has_images}
+- Numbered sections: {has_numbered_sections}
+"""
+
+_PROMPT_REVIEW_TMPL = """\
+## Content Review and Structure Validation
+
+```
+You are a technical documentation expert. Review the structure and content of these markdown files
+that were created by splitting a large document.
+
+**Context:**
+- Each file represents a section from the original document
+- Headers were promoted by one level (## became #, ### became ##, etc.)
+- Each file should be self-contained and make sense as a standalone document
+- Internal TOCs were generated automatically
+
+**Files to review:**
+{files}
+**Review criteria:**
+1. **Content completeness**: Each file should contain all necessary information
+2. **Logical flow**: Content should follow a logical sequence
+3. **Header hierarchy**: Headers should be properly nested and meaningful
+4. **TOC accuracy**: Internal TOCs should match the actual content structure
+5. **Cross-references**: Any remaining internal links should be valid
+{code_criterion}{image_criterion}\
+8. **Consistency**: Check for consistent formatting and style
+
+**Common issues to look for:**
+- Incomplete sections that reference content in other files
+{image_issue}\
+- Inconsistent header numbering or naming
+- Missing context that was in the original document
+- Duplicate content across files
+
+**Output format:**
+- Provide a summary of findings
+- List specific issues found in each file
+- Suggest improvements for structure and content
+- Recommend any files that should be merged or split differently
+```
+"""
+
+_PROMPT_REVIEW_CODE_CRITERION = (
+    "6. **Code blocks**: Ensure code examples are complete and properly formatted\n"
+)
+_PROMPT_REVIEW_IMAGE_CRITERION = (
+    "7. **Images and diagrams**: Verify that image references are correct\n"
+)
+_PROMPT_REVIEW_IMAGE_ISSUE = "- Broken image or file references\n"
+
+_PROMPT_BROKEN_LINKS_TMPL = """\
+## Fix Broken Links
+
+```
+You are a technical documentation expert. A large markdown file has been split into multiple files.
+Your task is to identify and fix broken links between sections.
+
+**Context:**
+- The original file was split based on ## headers
+- Each section became its own file with promoted headers
+- Internal links (#anchor) may now point to non-existent anchors
+- File references may need updating to point to correct files
+
+**Files to review:**
+{files}
+**Broken links detected:**
+{links}
+**Tasks:**
+1. Scan each file for markdown links: `[text](url)`
+2. Identify broken internal links (starting with #)
+3. Find the correct target file and anchor for each broken link
+4. Update file references to point to the correct split files
+5. Verify that all cross-references work correctly
+
+**Common patterns to fix:**
+- `[Section Name](#section-anchor)` → `[Section Name](filename.md#section-anchor)`
+- `[Previous Section](#previous)` → `[Previous Section](previous-file.md#previous)`
+- `[Next Section](#next)` → `[Next Section](next-file.md#next)`
+```
+"""
+
+_PROMPT_CODE_TMPL = """\
+## Code Block Validation
+
+```
+You are a technical documentation expert. Review the code blocks in these markdown files
+to ensure they are complete, properly formatted, and functional.
+
+**Files to review:**
+{files}
+**Tasks:**
+1. Check that all code blocks are properly closed with ```
+2. Verify that code examples are complete and runnable
+3. Ensure proper syntax highlighting is specified
+4. Check that code references (imports, functions) are valid
+5. Verify that code examples match the surrounding documentation
+```
+"""
+
+_PROMPT_IMAGES_TMPL = """\
+## Image and Media Validation
+
+```
+You are a technical documentation expert. Review the images and media references
+in these markdown files to ensure they are properly linked and accessible.
+
+**Files to review:**
+{files}
+**Tasks:**
+1. Check that all image references use proper markdown syntax: `![alt](path)`
+2. Verify that image paths are correct relative to the file location
+3. Ensure alt text is descriptive and meaningful
+4. Check that diagrams and charts are properly referenced
+5. Verify that any embedded media (videos, etc.) is accessible
+```
+"""
+
+
+@lru_cache(maxsize=4096)
+def _make_anchor(text: str) -> str:
+    """Create a GitHub-style anchor for a header text.
+
+    Headers such as "Overview" or "Examples" repeat across sections and are
+    anchored again for the main TOC, section TOCs and link checks, so results
+    are cached.
+
+    Args:
+        text: The text to convert to an anchor
+
+    Returns:
+        URL-safe anchor string
+    """
+    # Follow GitHub's exact standard for anchor generation
+    anchor = text.strip().lower()
+
+    # Remove markdown formatting (asterisks, backticks), dots and any other
+    # special character in one pass. GitHub preserves accented characters
+    # like á, é, í, ó, ú, ñ, so those are kept.
+    anchor = _ANCHOR_DROP.sub("", anchor)
+
+    # Replace runs of spaces and colons with a single hyphen. Existing
+    # hyphens are kept as-is, so "A - B" becomes "a---b" like on GitHub.
+    anchor = "-".join(anchor.replace(":", " ").split())
+
+    # Remove leading/trailing hyphens
+    anchor = anchor.strip("-")
+
+    return anchor
+
+
+def _promote_section_body(section_text: str) -> Tuple[List[str], List[str]]:
+    """Promote the headers of a section's text and collect its TOC entries.
+
+    Args:
+        section_text: Raw text of the section, including its title line
+
+    Returns:
+        Tuple of (body_lines, toc_entries), where body_lines has no trailing
+        empty lines
+    """
+    toc_entries = []
+
+    # Skip the original section title line (## ...)
+    title_match = _SECTION_TITLE_LINE.search(section_text)
+    if title_match:
+        section_text = (
+            section_text[: title_match.start()] + section_text[title_match.end() :]
+        )
+
+    def promote_header(match: Match[str]) -> str:
+        """Promote a ### to ###### header by one level and record it in the TOC."""
+        hashes, header_text = match.groups()
+        level = len(hashes)
+        if level < 3:
+            return match.group()
+
+        # Headers down to ##### get a TOC entry, indented by depth
+        if level < 6:
+            anchor = _make_anchor(header_text)
+            indent = "  " * (level - 3)
+            toc_entries.append(f"{indent}- [{header_text}](#{anchor})")
+
+        return f"\n{hashes[1:]} {header_text}"
+
+    # Promote all headers and collect the TOC in a single pass. A newline is
+    # put in front for a header on the first line and dropped afterwards.
+    section_text = _HEADER_SCAN.sub(promote_header, "\n" + section_text)[1:]
+
+    body_lines = section_text.split("\n")
+
+    # Clean up empty lines at the end
+    # Remove trailing empty lines
+    while body_lines and body_lines[-1].strip() == "":
+        body_lines.pop()
+
+    return body_lines, toc_entries
+
+
+def _parse_section_number(title: str) -> Optional[Tuple[int, str]]:
+    """Split a numbered section title ("3. Title") into number and text.
+
+    A hand-written scan is cheaper than a regex for such a short prefix: the
+    title must start with decimal digits and a dot, followed by optional
+    whitespace and some text.
+
+    Args:
+        title: Section title
+
+    Returns:
+        Tuple of (number, text), or None if the title is not numbered
+    """
+    length = len(title)
+    end = 0
+    while end < length and title[end].isdecimal():
+        end += 1
+    if not end or end == length or title[end] != ".":
+        return None
+
+    start = end + 1
+    while start < length and title[start].isspace():
+        start += 1
+    if start == length:
+        # Only whitespace after the dot: the text is its last character
+        if start == end + 1:
+            return None
+        start -= 1
+
+    return int(title[:end]), title[start:]
+
 
 @dataclass
 class Section:
     """Represents a section in the markdown file."""
 
+    # Declared by hand rather than with dataclass(slots=True), which needs
+    # Python 3.10
+    __slots__ = (
+        "title",
+        "start_line",
+        "end_line",
+        "level",
+        "filename",
+        "anchor",
+        "subsections",
+    )
+
     title: str
     start_line: int
     end_line: int
@@ -54,52 +361,168 @@ class MarkdownSplitter:
         self.source_file = Path(source_file)
         self.output_dir = Path(output_dir) if output_dir else self.source_file.parent
         self.debug = debug
-        self.content = self._read_file()
+        self._raw: Optional[str] = None
+        self._line_starts: Optional[Sequence[int]] = None
+        self._content: Optional[List[str]] = None
         self.sections: List[Section] = []
         self.broken_links: List[str] = []
 
-    def _read_file(self) -> List[str]:
+    @classmethod
+    def from_string(
+        cls,
+        text: str,
+        source_file: str = "document.md",
+        output_dir: Optional[str] = None,
+        debug: bool = False,
+    ) -> "MarkdownSplitter":
+        """Create a splitter for markdown text that is already in memory.
+
+        The text is used instead of reading source_file, which then only names
+        the document in messages and sets the default output directory.
+
+        Args:
+            text: Markdown text to split
+            source_file: Name of the source document
+            output_dir: Output directory (default: same as source file)
+            debug: Enable debug mode for detailed output
+
+        Returns:
+            Splitter for the given text
+        """
+        splitter = cls(source_file, output_dir, debug)
+        # Same newline translation as reading the file in text mode
+        splitter._raw = text.replace("\r\n", "\n").replace("\r", "\n")
+        return splitter
+
+    def _read_file(self) -> str:
         """Read the source markdown file.
 
         Returns:
-            List of lines from the file
+            Full text of the file
         """
         with open(self.source_file, "r", encoding="utf-8") as f:
-            return f.readlines()
+            return f.read()
 
-    def create_toc_anchor(self, text: str) -> str:
-        """Create a proper anchor for TOC links following GitHub's exact standard.
+    def _write_lines(self, path: Path, lines: Iterable[str]) -> None:
+        """Write lines separated by newlines, streaming them in chunks.
+
+        Joining a bounded number of lines at a time keeps the join in C without
+        building a string the size of the whole file first.
 
         Args:
-            text: The text to convert to an anchor
+            path: File to write
+            lines: Lines to write (without line endings)
+        """
+        lines = iter(lines)
+        with open(path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            chunk = list(islice(lines, _WRITE_CHUNK_LINES))
+            separator = ""
+            while chunk:
+                f.write(separator)
+                f.write("\n".join(chunk))
+                separator = "\n"
+                chunk = list(islice(lines, _WRITE_CHUNK_LINES))
+
+    @staticmethod
+    def _index_lines(raw: str) -> Sequence[int]:
+        """Compute the offset at which each line starts in the raw text.
+
+        Offsets are kept in a typed array rather than a list of int objects,
+        which takes about a quarter of the memory for large files.
+
+        Args:
+            raw: Full text of the file
 
         Returns:
-            URL-safe anchor string
+            Line start offsets, followed by the end offset of the text
         """
-        # Follow GitHub's exact standard for anchor generation
-        anchor = text.strip()
+        line_starts = array("Q", (0,))
+        line_starts.extend(m.end() for m in _NEWLINE.finditer(raw))
+        if line_starts[-1] != len(raw):
+            line_starts.append(len(raw))
+        return line_starts
+
+    def _load(self) -> str:
+        """Read the source file unless it is already loaded, and return it."""
+        if self._raw is None:
+            self._raw = self._read_file()
+        return self._raw
+
+    @property
+    def raw(self) -> str:
+        """Full text of the source file, read on first access."""
+        return self._load()
+
+    @property
+    def line_starts(self) -> Sequence[int]:
+        """Offsets at which each line starts in raw, computed on first access."""
+        if self._line_starts is None:
+            self._line_starts = self._index_lines(self.raw)
+        return self._line_starts
+
+    @property
+    def content(self) -> List[str]:
+        """Lines of the source file (with line endings), built on first access."""
+        if self._content is None:
+            raw, starts = self.raw, self.line_starts
+            self._content = [raw[start:end] for start, end in zip(starts, starts[1:])]
+        return self._content
+
+    def _get_lines_span(self, start_line: int, end_line: int) -> Tuple[int, int]:
+        """Get the offsets of a range of lines in the raw text.
+
+        Args:
+            start_line: First line of the range (1-based, inclusive)
+            end_line: Last line of the range (1-based, inclusive)
+
+        Returns:
+            Tuple of (start_offset, end_offset)
+        """
+        line_starts = self.line_starts
+        last = len(line_starts) - 1
+        start = line_starts[min(start_line - 1, last)]
+        end = line_starts[min(end_line, last)]
+        return start, end
+
+    def _get_lines_text(self, start_line: int, end_line: int) -> str:
+        """Get the raw text of a range of lines without re-joining them.
 
-        # Convert to lowercase
-        anchor = anchor.lower()
+        Args:
+            start_line: First line of the range (1-based, inclusive)
+            end_line: Last line of the range (1-based, inclusive)
 
-        # Remove markdown formatting characters (asterisks, backticks)
-        anchor = re.sub(r"[`*]", "", anchor)
+        Returns:
+            Text of the lines in the range, including line endings
+        """
+        start, end = self._get_lines_span(start_line, end_line)
+        return self.raw[start:end]
 
-        # Remove dots explicitly (instead of replacing them with hyphens)
-        anchor = re.sub(r"\.", "", anchor, flags=re.UNICODE)
+    def _get_head_lines(self, count: int) -> List[str]:
+        """Get the first lines of the file without splitting the whole file.
 
-        # Remove special characters except alphanumeric, spaces, hyphens, colons, and accented characters
-        # GitHub preserves accented characters like á, é, í, ó, ú, ñ, etc.
-        # Use a more precise pattern that matches GitHub's behavior exactly
-        anchor = re.sub(r"[^\w\s\-:áéíóúüñ]", "", anchor, flags=re.UNICODE)
+        Args:
+            count: Maximum number of lines to return
 
-        # Replace spaces and colons with hyphens
-        anchor = re.sub(r"[\s:]+", "-", anchor)
+        Returns:
+            List of lines (without line endings)
+        """
+        lines = self._get_lines_text(1, count).split("\n")
+        # Drop the empty string after the final line ending
+        if lines[-1] == "":
+            lines.pop()
+        return lines
+
+    @staticmethod
+    def create_toc_anchor(text: str) -> str:
+        """Create a proper anchor for TOC links following GitHub's exact standard.
 
-        # Remove leading/trailing hyphens
-        anchor = anchor.strip("-")
+        Args:
+            text: The text to convert to an anchor
 
-        return anchor
+        Returns:
+            URL-safe anchor string
+        """
+        return _make_anchor(text)
 
     def detect_toc(self) -> Optional[List[str]]:
         """Detect if there's an existing TOC in the first lines using multiple strategies.
@@ -133,28 +556,29 @@ class MarkdownSplitter:
         toc_lines = []
         in_toc = False
 
-        for line in self.content[:50]:
+        for line in self._get_head_lines(50):
             line = line.strip()
+            first_char = line[:1]
+
+            if first_char == "#":
+                # Look for TOC headers
+                if line.startswith(
+                    (
+                        "## Table of Contents",
+                        "# Table of Contents",
+                        "## Contents",
+                        "# Contents",
+                    )
+                ):
+                    in_toc = True
+                    continue
 
-            # Look for TOC headers
-            if line.startswith(
-                (
-                    "## Table of Contents",
-                    "# Table of Contents",
-                    "## Contents",
-                    "# Contents",
-                )
-            ):
-                in_toc = True
-                continue
-
-            if in_toc:
                 # End TOC when we hit another header
-                if line.startswith(("## ", "# ")):
+                if in_toc and line.startswith(("## ", "# ")):
                     break
+            elif in_toc and first_char == "-" and line.startswith("- "):
                 # Collect TOC entries
-                if line and line.startswith("- "):
-                    toc_lines.append(line)
+                toc_lines.append(line)
 
         return toc_lines if toc_lines else None
 
@@ -169,24 +593,27 @@ class MarkdownSplitter:
         max_headers_to_check = 4
         consecutive_toc_entries = 0
 
-        for line in self.content[:100]:  # Check first 100 lines
+        for line in self._get_head_lines(100):  # Check first 100 lines
             line = line.strip()
+            first_char = line[:1]
+            is_header = first_char == "#" and line.startswith(("## ", "# "))
 
             # Count headers
-            if line.startswith(("## ", "# ")):
+            if is_header:
                 header_count += 1
                 if header_count > max_headers_to_check:
                     break
 
             # Look for bullet points with markdown links: - [text](link)
-            if re.match(r"^\s*[-*]\s+\[.*\]\(.*\)", line):
+            # (only lines starting with a bullet marker can match)
+            if first_char in ("-", "*") and _TOC_BULLET_LINK.match(line):
                 toc_lines.append(line)
                 consecutive_toc_entries += 1
-            elif line.startswith(("## ", "# ")):
+            elif is_header:
                 # Reset if we hit a header
                 consecutive_toc_entries = 0
                 toc_lines = []  # Reset TOC lines
-            elif line and not line.startswith(("## ", "# ")):
+            elif line:
                 consecutive_toc_entries = 0
 
         # Only return if we found a reasonable number of consecutive TOC entries
@@ -202,20 +629,23 @@ class MarkdownSplitter:
         consecutive_bullets = 0
         max_consecutive = 0
 
-        for line in self.content[:100]:
+        for line in self._get_head_lines(100):
             line = line.strip()
+            first_char = line[:1]
 
             # Look for bullet patterns that could be TOC (without links)
-            if re.match(r"^\s*[-*]\s+[A-Za-z]", line):  # Bullet + capital letter
+            # (only lines starting with a bullet marker can match)
+            if first_char in ("-", "*") and _TOC_BULLET_ALPHA.match(line):
+                # Bullet + letter
                 consecutive_bullets += 1
                 toc_lines.append(line)
-            elif line.startswith(("## ", "# ")):
+            elif first_char == "#" and line.startswith(("## ", "# ")):
                 # Reset if we hit a header
                 if consecutive_bullets > max_consecutive:
                     max_consecutive = consecutive_bullets
                 consecutive_bullets = 0
                 toc_lines = []  # Reset TOC lines
-            elif line and not line.startswith(("## ", "# ")):
+            elif line:
                 consecutive_bullets = 0
 
         # Only return if we found a reasonable pattern
@@ -231,7 +661,19 @@ class MarkdownSplitter:
         current_section: Optional[Section] = None
         in_code_block = False
 
-        for line_num, line in enumerate(self.content, 1):
+        raw = self.raw
+        line_starts = self.line_starts
+
+        # Only fences and "## " lines affect the result, so let the regex engine
+        # find them instead of walking every line of the file. Matches after
+        # the first line start at the newline before the line.
+        first = _SECTION_LINE.match(raw)
+        candidates = chain(
+            [(0, first.group())] if first else [],
+            ((m.start() + 1, m.group()) for m in _SECTION_SCAN.finditer(raw)),
+        )
+        for offset, line in candidates:
+            line_num = bisect_right(line_starts, offset)
             line = line.strip()
 
             # Check if we're entering or leaving a code block
@@ -253,19 +695,24 @@ class MarkdownSplitter:
 
             if line.startswith("## ") and not line.startswith("## Table of Contents"):
                 # Found a main section
-                title = line.replace("## ", "").strip()
+                header_match = _HEADER_LINE.match(line)
+                # Always matches: the line starts with "## "
+                assert header_match is not None
+                title = header_match.group(2).strip()
 
                 if current_section:
                     current_section.end_line = line_num - 1
                     sections.append(current_section)
 
+                # Titles and anchors are reused as keys and in every output
+                # file, so keep a single shared copy of each
                 current_section = Section(
-                    title=title,
+                    title=sys.intern(title),
                     start_line=line_num,
-                    end_line=len(self.content),
+                    end_line=len(line_starts) - 1,
                     level=2,
                     filename="",
-                    anchor=self.create_toc_anchor(title),
+                    anchor=sys.intern(self.create_toc_anchor(title)),
                     subsections=[],
                 )
 
@@ -276,7 +723,11 @@ class MarkdownSplitter:
         return sections
 
     def determine_filename(
-        self, section: Section, index: int, all_sections: List[Section]
+        self,
+        section: Section,
+        index: int,
+        all_sections: List[Section],
+        last_numbers: Optional[List[int]] = None,
     ) -> str:
         """Determine filename based on numbering rules from the prompt.
 
@@ -284,6 +735,8 @@ class MarkdownSplitter:
             section: The section to determine filename for
             index: Index of the section in the list
             all_sections: List of all sections for context
+            last_numbers: Precomputed result of _last_section_numbers() for
+                all_sections (computed on demand if not given)
 
         Returns:
             Filename for the section
@@ -291,12 +744,11 @@ class MarkdownSplitter:
         title = section.title
 
         # Extract number from title if it exists
-        number_match = re.match(r"^(\d+)\.\s*(.+)$", title)
+        numbered = _parse_section_number(title)
 
-        if number_match:
+        if numbered:
             # Section has a number
-            number = int(number_match.group(1))
-            clean_title = number_match.group(2)
+            number, clean_title = numbered
             filename = f"{number:02d}-{self._to_kebab_case(clean_title)}.md"
         else:
             # Section has no number - determine based on position
@@ -305,11 +757,9 @@ class MarkdownSplitter:
                 filename = f"00-{self._to_kebab_case(title)}.md"
             else:
                 # Find the last numbered section before this one
-                last_number = 0
-                for prev_section in all_sections[:index]:
-                    prev_match = re.match(r"^(\d+)\.\s*(.+)$", prev_section.title)
-                    if prev_match:
-                        last_number = int(prev_match.group(1))
+                if last_numbers is None:
+                    last_numbers = self._last_section_numbers(all_sections[: index + 1])
+                last_number = last_numbers[index]
 
                 if last_number == 0:
                     # No previous numbered sections, use sequential
@@ -318,9 +768,29 @@ class MarkdownSplitter:
                     # Use the last number + 1
                     filename = f"{last_number + 1:02d}-{self._to_kebab_case(title)}.md"
 
-        return filename
+        return sys.intern(filename)
+
+    def _last_section_numbers(self, sections: List[Section]) -> List[int]:
+        """Find the number of the last numbered section before each section.
 
-    def _to_kebab_case(self, text: str) -> str:
+        Args:
+            sections: List of sections in document order
+
+        Returns:
+            For each section, the number of the closest preceding numbered
+            section, or 0 if there is none
+        """
+        last_numbers = []
+        last_number = 0
+        for section in sections:
+            last_numbers.append(last_number)
+            numbered = _parse_section_number(section.title)
+            if numbered:
+                last_number = numbered[0]
+        return last_numbers
+
+    @staticmethod
+    def _to_kebab_case(text: str) -> str:
         """Convert text to kebab-case.
 
         Args:
@@ -330,9 +800,9 @@ class MarkdownSplitter:
             Kebab-case version of the text
         """
         # Remove special characters and convert to lowercase
-        text = re.sub(r"[^\w\s-]", "", text.lower())
+        text = _KEBAB_STRIP.sub("", text.lower())
         # Replace spaces and multiple hyphens with single hyphens
-        text = re.sub(r"[\s-]+", "-", text)
+        text = _KEBAB_DASH.sub("-", text)
         return text.strip("-")
 
     def extract_section_content(self, section: Section) -> Tuple[List[str], List[str]]:
@@ -344,75 +814,34 @@ class MarkdownSplitter:
         Returns:
             Tuple of (processed_lines, toc_entries)
         """
-        section_lines = self.content[section.start_line - 1 : section.end_line]
-
-        # First pass: collect all headers that exist in this section
-        # Filter out empty lines at the beginning and end
-        processed_lines = []
-        toc_entries = []
+        title_lines, body_lines, toc_entries = self._build_section_parts(section)
 
-        processed_lines.append(f"# {section.title} <!-- omit in toc -->")
-        processed_lines.append("")
+        processed_lines = title_lines
+        processed_lines.extend(body_lines)
+        if body_lines:
+            # Add one final empty line
+            processed_lines.append("")
 
-        # Collect headers that actually exist in this section
-        # Track if we've started processing content
-        # Skip the original section title line (## ...)
-        content_started = False
-
-        for line in section_lines:
-            line = line.rstrip("\n")
-
-            # Skip empty lines at the beginning
-            if line.startswith("## ") and not content_started:
-                content_started = True
-                continue
-
-            if line.startswith("### "):
-                # Only add to TOC if this header actually exists in this section
-                header_text = line.replace("### ", "")
-                new_header = f"## {header_text}"
-                processed_lines.append(new_header)
-                # Add to TOC
-                anchor = self.create_toc_anchor(header_text)
-                toc_entries.append(f"- [{header_text}](#{anchor})")
-
-            elif line.startswith("#### "):
-                # Only add to TOC if this header actually exists in this section
-                header_text = line.replace("#### ", "")
-                new_header = f"### {header_text}"
-                processed_lines.append(new_header)
-                # Add to TOC with indent
-                anchor = self.create_toc_anchor(header_text)
-                toc_entries.append(f"  - [{header_text}](#{anchor})")
-
-            elif line.startswith("##### "):
-                # Only add to TOC if this header actually exists in this section
-                header_text = line.replace("##### ", "")
-                new_header = f"#### {header_text}"
-                processed_lines.append(new_header)
-                # Add to TOC with more indent
-                anchor = self.create_toc_anchor(header_text)
-                toc_entries.append(f"    - [{header_text}](#{anchor})")
-
-            elif line.startswith("###### "):
-                # Only add to TOC if this header actually exists in this section
-                header_text = line.replace("###### ", "")
-                new_header = f"##### {header_text}"
-                processed_lines.append(new_header)
+        return processed_lines, toc_entries
 
-            else:
-                processed_lines.append(line)
+    def _build_section_parts(
+        self, section: Section
+    ) -> Tuple[List[str], List[str], List[str]]:
+        """Build the title, promoted body and TOC entries of a section file.
 
-        # Clean up empty lines at the end
-        # Remove trailing empty lines
-        while processed_lines and processed_lines[-1].strip() == "":
-            processed_lines.pop()
+        Args:
+            section: Section to extract content from
 
-        # Add one final empty line
-        processed_lines.append("")
+        Returns:
+            Tuple of (title_lines, body_lines, toc_entries), where body_lines
+            has no trailing empty lines
+        """
+        section_text = self._get_lines_text(section.start_line, section.end_line)
+        body_lines, toc_entries = _promote_section_body(section_text)
+        title_lines = [f"# {section.title} <!-- omit in toc -->", ""]
 
         # Only return TOC entries if there are actually headers in this section
-        return processed_lines, toc_entries
+        return title_lines, body_lines, toc_entries
 
     def create_main_toc(self, sections: List[Section]) -> List[str]:
         """Create the main TOC file content.
@@ -450,18 +879,15 @@ class MarkdownSplitter:
             List of broken link descriptions
         """
         broken_links = []
-        section_anchors = {section.anchor: section.filename for section in sections}
+        section_anchors = frozenset(section.anchor for section in sections)
 
         for section in sections:
-            section_content = "\n".join(
-                self.content[section.start_line - 1 : section.end_line]
-            )
+            # Find all markdown links, scanning the section's span of the raw
+            # text in place instead of copying it out
+            start, end = self._get_lines_span(section.start_line, section.end_line)
 
-            # Find all markdown links
-            link_pattern = r"\[([^\]]+)\]\(([^)]+)\)"
-            matches = re.findall(link_pattern, section_content)
-
-            for link_text, link_url in matches:
+            for match in _LINK_PATTERN.finditer(self.raw, start, end):
+                link_text, link_url = match.groups()
                 if link_url.startswith("#"):
                     # Internal link
                     anchor = link_url[1:]  # Remove #
@@ -479,223 +905,65 @@ class MarkdownSplitter:
 
     def _generate_prompts_file(self) -> None:
         """Generate context-aware prompts based on the actual split results."""
-        prompts = []
-
         # Analyze the split to determine what kind of prompts are needed
         has_broken_links = len(self.broken_links) > 0
-        has_code_blocks = any(
-            "```" in "\n".join(self.content[section.start_line - 1 : section.end_line])
-            for section in self.sections
-        )
-        has_images = any(
-            "!" in "\n".join(self.content[section.start_line - 1 : section.end_line])
-            for section in self.sections
-        )
+        has_code_blocks = False
+        has_images = False
+        if self.sections:
+            # Sections are contiguous, so search their whole span in place
+            start, end = self._get_lines_span(
+                self.sections[0].start_line, self.sections[-1].end_line
+            )
+            has_code_blocks = self.raw.find("```", start, end) != -1
+            has_images = self.raw.find("![", start, end) != -1
         has_numbered_sections = any(
-            re.match(r"^\d+\.", section.title) for section in self.sections
+            _NUMBER_PREFIX.match(section.title) for section in self.sections
         )
 
-        prompts.append("# Recommended Prompts for Post-Processing")
-        prompts.append("")
-        prompts.append(
-            "This file contains ready-to-use prompts for LLMs to help with post-processing"
-        )
-        prompts.append(
-            "the split markdown files. Copy and paste these prompts into your preferred LLM."
-        )
-        prompts.append("")
-        prompts.append("**Split Summary:**")
-        prompts.append(f"- Total sections: {len(self.sections)}")
-        prompts.append(f"- Broken links detected: {len(self.broken_links)}")
-        prompts.append(f"- Contains code blocks: {has_code_blocks}")
-        prompts.append(f"- Contains images: {has_images}")
-        prompts.append(f"- Numbered sections: {has_numbered_sections}")
-        prompts.append("")
+        parts = [
+            _PROMPT_HEADER_TMPL.format(
+                total=len(self.sections),
+                broken=len(self.broken_links),
+                has_code_blocks=has_code_blocks,
+                has_images=has_images,
+                has_numbered_sections=has_numbered_sections,
+            )
+        ]
 
         # Always include the basic content review prompt
-        prompts.append("## Content Review and Structure Validation")
-        prompts.append("")
-        prompts.append("```")
-        prompts.append(
-            "You are a technical documentation expert. Review the structure and content of these markdown files"
-        )
-        prompts.append("that were created by splitting a large document.")
-        prompts.append("")
-        prompts.append("**Context:**")
-        prompts.append("- Each file represents a section from the original document")
-        prompts.append(
-            "- Headers were promoted by one level (## became #, ### became ##, etc.)"
-        )
-        prompts.append(
-            "- Each file should be self-contained and make sense as a standalone document"
-        )
-        prompts.append("- Internal TOCs were generated automatically")
-        prompts.append("")
-        prompts.append("**Files to review:**")
-        for section in self.sections:
-            prompts.append(f"- {section.filename}: {section.title}")
-        prompts.append("")
-        prompts.append("**Review criteria:**")
-        prompts.append(
-            "1. **Content completeness**: Each file should contain all necessary information"
-        )
-        prompts.append("2. **Logical flow**: Content should follow a logical sequence")
-        prompts.append(
-            "3. **Header hierarchy**: Headers should be properly nested and meaningful"
-        )
-        prompts.append(
-            "4. **TOC accuracy**: Internal TOCs should match the actual content structure"
-        )
-        prompts.append(
-            "5. **Cross-references**: Any remaining internal links should be valid"
-        )
-
-        if has_code_blocks:
-            prompts.append(
-                "6. **Code blocks**: Ensure code examples are complete and properly formatted"
-            )
-        if has_images:
-            prompts.append(
-                "7. **Images and diagrams**: Verify that image references are correct"
+        parts.append(
+            _PROMPT_REVIEW_TMPL.format(
+                files="".join(
+                    f"- {section.filename}: {section.title}\n"
+                    for section in self.sections
+                ),
+                code_criterion=_PROMPT_REVIEW_CODE_CRITERION if has_code_blocks else "",
+                image_criterion=_PROMPT_REVIEW_IMAGE_CRITERION if has_images else "",
+                image_issue=_PROMPT_REVIEW_IMAGE_ISSUE if has_images else "",
             )
-
-        prompts.append("8. **Consistency**: Check for consistent formatting and style")
-        prompts.append("")
-        prompts.append("**Common issues to look for:**")
-        prompts.append("- Incomplete sections that reference content in other files")
-        if has_images:
-            prompts.append("- Broken image or file references")
-        prompts.append("- Inconsistent header numbering or naming")
-        prompts.append("- Missing context that was in the original document")
-        prompts.append("- Duplicate content across files")
-        prompts.append("")
-        prompts.append("**Output format:**")
-        prompts.append("- Provide a summary of findings")
-        prompts.append("- List specific issues found in each file")
-        prompts.append("- Suggest improvements for structure and content")
-        prompts.append(
-            "- Recommend any files that should be merged or split differently"
         )
-        prompts.append("```")
-        prompts.append("")
+
+        filenames = "".join(f"- {section.filename}\n" for section in self.sections)
 
         # Include broken links prompt only if there are broken links
         if has_broken_links:
-            prompts.append("## Fix Broken Links")
-            prompts.append("")
-            prompts.append("```")
-            prompts.append(
-                "You are a technical documentation expert. A large markdown file has been split into multiple files."
-            )
-            prompts.append(
-                "Your task is to identify and fix broken links between sections."
-            )
-            prompts.append("")
-            prompts.append("**Context:**")
-            prompts.append("- The original file was split based on ## headers")
-            prompts.append("- Each section became its own file with promoted headers")
-            prompts.append(
-                "- Internal links (#anchor) may now point to non-existent anchors"
-            )
-            prompts.append(
-                "- File references may need updating to point to correct files"
-            )
-            prompts.append("")
-            prompts.append("**Files to review:**")
-            for section in self.sections:
-                prompts.append(f"- {section.filename}")
-            prompts.append("")
-            prompts.append("**Broken links detected:**")
-            for link in self.broken_links:
-                prompts.append(f"- {link}")
-            prompts.append("")
-            prompts.append("**Tasks:**")
-            prompts.append("1. Scan each file for markdown links: `[text](url)`")
-            prompts.append("2. Identify broken internal links (starting with #)")
-            prompts.append(
-                "3. Find the correct target file and anchor for each broken link"
-            )
-            prompts.append(
-                "4. Update file references to point to the correct split files"
-            )
-            prompts.append("5. Verify that all cross-references work correctly")
-            prompts.append("")
-            prompts.append("**Common patterns to fix:**")
-            prompts.append(
-                "- `[Section Name](#section-anchor)` → `[Section Name](filename.md#section-anchor)`"
-            )
-            prompts.append(
-                "- `[Previous Section](#previous)` → `[Previous Section](previous-file.md#previous)`"
-            )
-            prompts.append(
-                "- `[Next Section](#next)` → `[Next Section](next-file.md#next)`"
+            parts.append(
+                _PROMPT_BROKEN_LINKS_TMPL.format(
+                    files=filenames,
+                    links="".join(f"- {link}\n" for link in self.broken_links),
+                )
             )
-            prompts.append("```")
-            prompts.append("")
 
         # Add specialized prompts based on content analysis
         if has_code_blocks:
-            prompts.append("## Code Block Validation")
-            prompts.append("")
-            prompts.append("```")
-            prompts.append(
-                "You are a technical documentation expert. Review the code blocks in these markdown files"
-            )
-            prompts.append(
-                "to ensure they are complete, properly formatted, and functional."
-            )
-            prompts.append("")
-            prompts.append("**Files to review:**")
-            for section in self.sections:
-                prompts.append(f"- {section.filename}")
-            prompts.append("")
-            prompts.append("**Tasks:**")
-            prompts.append("1. Check that all code blocks are properly closed with ```")
-            prompts.append("2. Verify that code examples are complete and runnable")
-            prompts.append("3. Ensure proper syntax highlighting is specified")
-            prompts.append(
-                "4. Check that code references (imports, functions) are valid"
-            )
-            prompts.append(
-                "5. Verify that code examples match the surrounding documentation"
-            )
-            prompts.append("```")
-            prompts.append("")
+            parts.append(_PROMPT_CODE_TMPL.format(files=filenames))
 
         if has_images:
-            prompts.append("## Image and Media Validation")
-            prompts.append("")
-            prompts.append("```")
-            prompts.append(
-                "You are a technical documentation expert. Review the images and media references"
-            )
-            prompts.append(
-                "in these markdown files to ensure they are properly linked and accessible."
-            )
-            prompts.append("")
-            prompts.append("**Files to review:**")
-            for section in self.sections:
-                prompts.append(f"- {section.filename}")
-            prompts.append("")
-            prompts.append("**Tasks:**")
-            prompts.append(
-                "1. Check that all image references use proper markdown syntax: `![alt](path)`"
-            )
-            prompts.append(
-                "2. Verify that image paths are correct relative to the file location"
-            )
-            prompts.append("3. Ensure alt text is descriptive and meaningful")
-            prompts.append("4. Check that diagrams and charts are properly referenced")
-            prompts.append(
-                "5. Verify that any embedded media (videos, etc.) is accessible"
-            )
-            prompts.append("```")
-            prompts.append("")
+            parts.append(_PROMPT_IMAGES_TMPL.format(files=filenames))
 
         # Write prompts to file
         prompts_file = self.output_dir / "recommended_prompts.txt"
-        with open(prompts_file, "w", encoding="utf-8") as f:
-            f.write("\n".join(prompts))
+        self._write_lines(prompts_file, parts)
 
         print(f"Created: {prompts_file}")
         print(
@@ -704,6 +972,10 @@ class MarkdownSplitter:
 
     def split_file(self) -> None:
         """Main method to split the file."""
+        # Read the source before creating anything, so a missing file fails
+        # without leaving an output directory behind
+        self._load()
+
         if self.debug:
             print("🔍 DEBUG: Starting split process")
             print(f"🔍 DEBUG: Source file: {self.source_file}")
@@ -726,15 +998,17 @@ class MarkdownSplitter:
         print(f"Found {len(self.sections)} sections")
 
         # Determine filenames
+        last_numbers = self._last_section_numbers(self.sections)
         for i, section in enumerate(self.sections):
-            section.filename = self.determine_filename(section, i, self.sections)
+            section.filename = self.determine_filename(
+                section, i, self.sections, last_numbers
+            )
             print(f"  {section.filename}: {section.title}")
 
         # Create main TOC file
         toc_content = self.create_main_toc(self.sections)
         toc_file = self.output_dir / "00-toc.md"
-        with open(toc_file, "w", encoding="utf-8") as f:
-            f.write("\n".join(toc_content))
+        self._write_lines(toc_file, toc_content)
         print(f"Created: {toc_file}")
 
         # Process each section
@@ -743,25 +1017,21 @@ class MarkdownSplitter:
                 print(f"🔍 DEBUG: Processing section: {section.title}")
                 print(f"🔍 DEBUG: Lines {section.start_line}-{section.end_line}")
 
-            processed_lines, toc_entries = self.extract_section_content(section)
+            title_lines, body_lines, toc_entries = self._build_section_parts(section)
 
             # Insert TOC after title if there are TOC entries
             if toc_entries:
-                final_lines = processed_lines[:2]  # Title and empty line
-                final_lines.append("## Table of Contents <!-- omit in toc -->")
-                final_lines.append("")  # Add blank line after TOC header
-                final_lines.extend(toc_entries)
-                # Add the rest of the content, but skip the first two lines (title and empty line)
-                # and the last line (empty line) since we already added one
-                if len(processed_lines) > 3:
-                    final_lines.extend(processed_lines[2:-1])
+                toc_header = ["## Table of Contents <!-- omit in toc -->", ""]
+                final_lines = chain(title_lines, toc_header, toc_entries, body_lines)
             else:
-                final_lines = processed_lines
+                # Add one final empty line after the content
+                final_lines = chain(
+                    title_lines, body_lines, ("",) if body_lines else ()
+                )
 
             # Write the output
             output_file = self.output_dir / section.filename
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write("\n".join(final_lines))
+            self._write_lines(output_file, final_lines)
 
             print(f"Created: {output_file}")
 
@@ -791,29 +1061,61 @@ class MarkdownSplitter:
         """
         issues = []
 
-        # Check each generated file
-        for section in self.sections:
-            file_path = self.output_dir / section.filename
+        # List the output directory once instead of checking each file
+        entries = self._scan_output_dir()
 
-            if not file_path.exists():
+        # Check each generated file
+        contents = self._read_output_files(
+            [self.output_dir / section.filename for section in self.sections]
+        )
+        for section, content in zip(self.sections, contents):
+            if content is None:
                 issues.append(f"❌ File {section.filename} was not created")
                 continue
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                file_issues = self._validate_file_quality(section, content)
-                issues.extend(file_issues)
+            issues.extend(self._validate_file_quality(section, content))
 
         # Check TOC file
-        toc_issues = self._validate_toc_quality()
+        toc_issues = self._validate_toc_quality(entries)
         issues.extend(toc_issues)
 
         # Check overall structure
-        structure_issues = self._validate_structure_quality()
+        structure_issues = self._validate_structure_quality(entries)
         issues.extend(structure_issues)
 
         return issues
 
+    def _scan_output_dir(self) -> Dict[str, os.DirEntry]:
+        """List the files in the output directory with a single scandir call.
+
+        Returns:
+            Directory entries of the output files, by filename
+        """
+        try:
+            with os.scandir(self.output_dir) as it:
+                return {entry.name: entry for entry in it if entry.is_file()}
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def _read_output_files(paths: List[Path]) -> List[Optional[str]]:
+        """Read several generated files.
+
+        Args:
+            paths: Files to read
+
+        Returns:
+            Contents of each file, in order, or None for files that do not exist
+        """
+        contents: List[Optional[str]] = []
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    contents.append(f.read())
+            except FileNotFoundError:
+                contents.append(None)
+        return contents
+
     def _validate_file_quality(self, section: Section, content: str) -> List[str]:
         """Validate quality of a single file.
 
@@ -833,24 +1135,27 @@ class MarkdownSplitter:
 
         # Check for TOC section
         if "## Table of Contents" not in content:
-            # Only warn if the file has subsections (## headers)
-            has_subsections = any(
-                line.startswith("## ") and not line.startswith("## Table of Contents")
-                for line in lines
-            )
+            # Only warn if the file has subsections (## headers). No line can
+            # be a TOC header here, so any "## " line counts, including lines
+            # inside code blocks.
+            has_subsections = content.startswith("## ") or "\n## " in content
             if has_subsections:
                 issues.append(
                     f"⚠️  {section.filename}: Missing Table of Contents section"
                 )
             # If no subsections, it's normal to not have a TOC
 
+        # Collect headers once for the hierarchy and link checks
+        debug_info: Optional[List[str]] = [] if self.debug else None
+        headers = self._collect_headers(lines, debug_info)
+
         # Check header hierarchy
-        header_issues = self._validate_header_hierarchy(content)
+        header_issues = self._validate_header_hierarchy(content, headers, debug_info)
         for issue in header_issues:
             issues.append(f"⚠️  {section.filename}: {issue}")
 
         # Check for broken internal links
-        broken_links = self._find_broken_internal_links(content, section)
+        broken_links = self._find_broken_internal_links(content, section, headers)
         for link in broken_links:
             issues.append(f"❌ {section.filename}: Broken internal link: {link}")
 
@@ -860,130 +1165,189 @@ class MarkdownSplitter:
 
         return issues
 
-    def _validate_header_hierarchy(self, content: str) -> List[str]:
-        """Validate that headers follow proper hierarchy.
+    @staticmethod
+    def _collect_headers(
+        lines: List[str], debug_info: Optional[List[str]] = None
+    ) -> List[Tuple[int, str, bool]]:
+        """Collect the headers of a file in a single pass.
+
+        Header hierarchy validation and anchor extraction both work from this
+        list. Headers inside code blocks are flagged rather than dropped: they
+        are not part of the hierarchy, but anchors are still created for them
+        since example links in the same code blocks point at them.
 
         Args:
-            content: Content to validate
+            lines: Content split on newlines
+            debug_info: If given, receives a trace of how each line was handled
 
         Returns:
-            List of header hierarchy issues
+            List of (level, text, in_code_block) tuples in document order
         """
-        issues = []
-        debug_info = []
-        lines = content.split("\n")
-        current_level = None
+        headers = []
         in_code_block = False
 
         for line in lines:
+            # Only lines starting with a backtick, whitespace or a hash can be
+            # fences or headers, so most lines are settled without copying
+            # them through strip() or lstrip()
+            first_char = line[:1]
+
             # Check if we're entering or leaving a code block
-            if line.strip().startswith("```"):
+            maybe_fence = first_char == "`" or first_char.isspace()
+            if maybe_fence and line.strip().startswith("```"):
                 in_code_block = not in_code_block
-                if self.debug:
+                if debug_info is not None:
                     debug_info.append(
                         f"Code block {'started' if in_code_block else 'ended'}: {line.strip()}"
                     )
                 continue
 
-            # Skip lines inside code blocks
-            if in_code_block:
-                if self.debug:
-                    debug_info.append(f"Code line (ignored): {line.strip()}")
+            # One to six hashes followed by whitespace, checked with plain
+            # string operations since this runs for every line
+            is_header = False
+            if first_char == "#":
+                level = len(line) - len(line.lstrip("#"))
+                is_header = level <= 6 and line[level : level + 1].isspace()
+            if is_header:
+                headers.append((level, line[level:].strip(), in_code_block))
+
+            if debug_info is None:
                 continue
+            if in_code_block:
+                debug_info.append(f"Code line (ignored): {line.strip()}")
+            elif is_header:
+                debug_info.append(f"Header: {line.strip()} (level {level})")
+            elif line.strip().startswith("**") and line.strip().endswith("**"):
+                debug_info.append(f"Bold text (ignored): {line.strip()}")
 
-            if re.match(r"^#{1,6}\s+", line):
-                level = len(line) - len(line.lstrip("#"))
+        return headers
 
-                if self.debug:
-                    debug_info.append(f"Header: {line.strip()} (level {level})")
+    def _validate_header_hierarchy(
+        self,
+        content: str,
+        headers: Optional[List[Tuple[int, str, bool]]] = None,
+        debug_info: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Validate that headers follow proper hierarchy.
 
-                if current_level is None:
-                    current_level = level
-                    if self.debug:
-                        debug_info.append(
-                            f"  → First header, setting current_level = {level}"
-                        )
-                else:
-                    # Only report jumps if the previous level was a real header
-                    if level > current_level + 1:
-                        jump_info = f"Header level jump: {current_level} → {level}"
-                        issues.append(jump_info)
-                        if self.debug:
-                            debug_info.append(f"  → WARNING: {jump_info}")
-                    else:
-                        if self.debug:
-                            debug_info.append(
-                                f"  → Valid jump: {current_level} → {level}"
-                            )
-                    current_level = level
-            # If line doesn't start with #, keep current_level unchanged
-            elif line.strip().startswith("**") and line.strip().endswith("**"):
-                if self.debug:
-                    debug_info.append(f"Bold text (ignored): {line.strip()}")
+        Args:
+            content: Content to validate
+            headers: Result of _collect_headers() for the content, if the
+                caller has it
+            debug_info: Trace filled in by _collect_headers(), if any
+
+        Returns:
+            List of header hierarchy issues
+        """
+        if headers is None:
+            debug_info = [] if self.debug else None
+            headers = self._collect_headers(content.split("\n"), debug_info)
 
-        # Only show debug info if there are issues and debug is enabled
-        if issues and self.debug:
+        issues = []
+        notes: List[str] = []
+        debug = debug_info is not None
+        current_level = None
+
+        for level, _text, in_code_block in headers:
+            # Skip headers inside code blocks
+            if in_code_block:
+                continue
+
+            # Notes for the debug trace are only formatted when it is kept
+            if current_level is None:
+                if debug:
+                    notes.append(f"  → First header, setting current_level = {level}")
+            # Only report jumps if the previous level was a real header
+            elif level > current_level + 1:
+                jump_info = f"Header level jump: {current_level} → {level}"
+                issues.append(jump_info)
+                if debug:
+                    notes.append(f"  → WARNING: {jump_info}")
+            elif debug:
+                notes.append(f"  → Valid jump: {current_level} → {level}")
+            current_level = level
+
+        # Only show debug info if there are issues and debug is enabled. Each
+        # header line of the trace is followed by the note on its level.
+        if issues and debug_info is not None:
             print("🔍 Header hierarchy debug info:")
+            header_notes = iter(notes)
             for info in debug_info:
                 print(f"    {info}")
+                if info.startswith("Header: "):
+                    print(f"    {next(header_notes)}")
 
         return issues
 
-    def _find_broken_internal_links(self, content: str, _section: Section) -> List[str]:
+    def _find_broken_internal_links(
+        self,
+        content: str,
+        _section: Section,
+        headers: Optional[List[Tuple[int, str, bool]]] = None,
+    ) -> List[str]:
         """Find broken internal links in content.
 
         Args:
             content: Content to check for broken links
             _section: Section being checked (unused but kept for interface consistency)
+            headers: Result of _collect_headers() for the content, if the
+                caller has it
 
         Returns:
             List of broken link descriptions
         """
-        broken_links = []
+        # Most files have no internal links at all: skip the anchors then
+        if "](#" not in content:
+            return []
 
-        # Extract all anchors from this file
-        anchors = self._extract_anchors_from_content(content)
+        broken_links = []
 
-        # Find all internal links
-        link_pattern = r"\[([^\]]+)\]\(#([^)]+)\)"
-        matches = re.findall(link_pattern, content)
+        # Extract all anchors from this file, as a set for quick lookups
+        anchors = set(self._extract_anchors_from_content(content, headers))
 
-        for link_text, anchor in matches:
+        # Check all internal links
+        for link_text, anchor in _INTERNAL_LINK.findall(content):
             if anchor not in anchors:
                 broken_links.append(f"[{link_text}](#{anchor})")
 
         return broken_links
 
-    def _extract_anchors_from_content(self, content: str) -> List[str]:
+    def _extract_anchors_from_content(
+        self, content: str, headers: Optional[List[Tuple[int, str, bool]]] = None
+    ) -> List[str]:
         """Extract all potential anchors from content.
 
         Args:
             content: Content to extract anchors from
+            headers: Result of _collect_headers() for the content, if the
+                caller has it
 
         Returns:
             List of anchor strings
         """
-        anchors = []
-
-        # Find all headers and create anchors
-        header_pattern = r"^(#{1,6})\s+(.+)$"
-        for match in re.finditer(header_pattern, content, re.MULTILINE):
-            header_text = match.group(2)
-            anchor = self.create_toc_anchor(header_text)
-            anchors.append(anchor)
+        if headers is None:
+            headers = self._collect_headers(content.split("\n"))
 
-        return anchors
+        # Create an anchor for every header
+        return [self.create_toc_anchor(text) for _level, text, _in_code in headers]
 
-    def _validate_toc_quality(self) -> List[str]:
+    def _validate_toc_quality(
+        self, entries: Optional[Dict[str, os.DirEntry]] = None
+    ) -> List[str]:
         """Validate the main TOC file.
 
+        Args:
+            entries: Result of _scan_output_dir(), if the caller has it
+
         Returns:
             List of TOC quality issues
         """
         issues = []
         toc_file = self.output_dir / "00-toc.md"
+        if entries is None:
+            entries = self._scan_output_dir()
 
-        if not toc_file.exists():
+        if toc_file.name not in entries:
             issues.append("❌ Main TOC file (00-toc.md) was not created")
             return issues
 
@@ -994,42 +1358,49 @@ class MarkdownSplitter:
         if "<!-- omit in toc -->" not in content:
             issues.append("⚠️  Main TOC: Missing omit comment")
 
-        # Check that all sections are linked
+        # Check that all sections are linked. The filenames are normally link
+        # targets in the TOC, so look them up in a set first and only search
+        # the whole content for the others.
+        link_targets = {url for _text, url in _LINK_PATTERN.findall(content)}
         for section in self.sections:
-            if section.filename not in content:
-                issues.append(f"❌ Main TOC: Missing link to {section.filename}")
+            filename = section.filename
+            if filename not in link_targets and filename not in content:
+                issues.append(f"❌ Main TOC: Missing link to {filename}")
 
         return issues
 
-    def _validate_structure_quality(self) -> List[str]:
+    def _validate_structure_quality(
+        self, entries: Optional[Dict[str, os.DirEntry]] = None
+    ) -> List[str]:
         """Validate overall structure quality.
 
+        Args:
+            entries: Result of _scan_output_dir(), if the caller has it
+
         Returns:
             List of structure quality issues
         """
         issues = []
 
         # Check for consistent numbering
-        numbered_sections = [s for s in self.sections if re.match(r"^\d+\.", s.title)]
-        if numbered_sections:
-            numbers = [
-                int(re.match(r"^(\d+)\.", s.title).group(1)) for s in numbered_sections
-            ]
-            expected_numbers = list(range(1, len(numbers) + 1))
-            if numbers != expected_numbers:
-                issues.append(f"⚠️  Inconsistent section numbering: {numbers}")
+        number_matches = (_NUMBER_PREFIX.match(s.title) for s in self.sections)
+        numbers = [int(match.group(1)) for match in number_matches if match]
+        if any(number != expected for expected, number in enumerate(numbers, 1)):
+            issues.append(f"⚠️  Inconsistent section numbering: {numbers}")
 
         # Check for duplicate filenames
-        filenames = [s.filename for s in self.sections]
-        duplicates = [f for f in set(filenames) if filenames.count(f) > 1]
+        filename_counts = Counter(s.filename for s in self.sections)
+        duplicates = [f for f, count in filename_counts.items() if count > 1]
         if duplicates:
             issues.append(f"❌ Duplicate filenames: {duplicates}")
 
         # Check for reasonable file sizes
+        if entries is None:
+            entries = self._scan_output_dir()
         for section in self.sections:
-            file_path = self.output_dir / section.filename
-            if file_path.exists():
-                size = file_path.stat().st_size
+            entry = entries.get(section.filename)
+            if entry is not None:
+                size = entry.stat().st_size
                 if size < 100:  # Very small files might be incomplete
                     issues.append(
                         f"⚠️  {section.filename}: Very small file ({size} bytes)"
@@ -1065,9 +1436,10 @@ def main() -> None:
     if args.dry_run:
         # Show what would be created
         sections = splitter.analyze_sections()
+        last_numbers = splitter._last_section_numbers(sections)
         print(f"Would create {len(sections)} files:")
         for i, section in enumerate(sections):
-            filename = splitter.determine_filename(section, i, sections)
+            filename = splitter.determine_filename(section, i, sections, last_numbers)
             print(f"  {filename}: {section.title}")
     else:
         splitter.split_file()
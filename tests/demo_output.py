@@ -0,0 +1,9 @@
+"""Output helper shared by the demo scripts in this directory."""
+
+import sys
+
+
+def emit(lines):
+    """Write a block of output lines with a single write call."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -5,6 +5,7 @@ Edge Cases Demo for Markdown Section Splitter
 This script demonstrates specific edge cases and shows how the splitter handles them.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -12,6 +13,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from markdown_section_splitter import MarkdownSplitter
+from tests.demo_output import emit
 import tempfile
 
 
@@ -21,13 +23,6 @@ def demo_anchor_generation():
     print("🔗 ANCHOR GENERATION DEMO")
     print("=" * 40)
     
-    # Create a dummy splitter just for anchor generation
-    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False)
-    temp_file.write("# Test")
-    temp_file.close()
-    
-    splitter = MarkdownSplitter(temp_file.name)
-    
     test_cases = [
         # Spanish with accents (essential for testing)
         ("Configuración Básica", "Spanish with accents"),
@@ -74,12 +69,14 @@ def demo_anchor_generation():
         ("Section-with-hyphens", "Hyphens in title"),
     ]
     
+    out = []
     for i, (title, description) in enumerate(test_cases, 1):
-        anchor = splitter.create_toc_anchor(title)
-        print(f"{i:2d}. {description}")
-        print(f"    Input:  '{title}'")
-        print(f"    Anchor: '{anchor}'")
-        print()
+        anchor = MarkdownSplitter.create_toc_anchor(title)
+        out.append(f"{i:2d}. {description}")
+        out.append(f"    Input:  '{title}'")
+        out.append(f"    Anchor: '{anchor}'")
+        out.append("")
+    emit(out)
 
 
 def demo_filename_generation():
@@ -125,7 +122,10 @@ Content 9
     temp_file.close()
     
     splitter = MarkdownSplitter(temp_file.name)
-    sections = splitter.analyze_sections()
+    try:
+        sections = splitter.analyze_sections()
+    finally:
+        os.unlink(temp_file.name)
     
     # Generate filenames
     for i, section in enumerate(sections):
@@ -134,8 +134,10 @@ Content 9
     print("Generated Filenames:")
     print("-" * 20)
     
-    for i, section in enumerate(sections, 1):
-        print(f"{i:2d}. {section.filename:<45} ← '{section.title}'")
+    emit([
+        f"{i:2d}. {section.filename:<45} ← '{section.title}'"
+        for i, section in enumerate(sections, 1)
+    ])
     
     print()
 
@@ -193,13 +195,18 @@ This is in a comment.
     temp_file.close()
     
     splitter = MarkdownSplitter(temp_file.name)
-    sections = splitter.analyze_sections()
+    try:
+        sections = splitter.analyze_sections()
+    finally:
+        os.unlink(temp_file.name)
     
     print("Detected Sections (should filter malformed):")
     print("-" * 45)
     
-    for i, section in enumerate(sections, 1):
-        print(f"{i:2d}. '{section.title}' (lines {section.start_line}-{section.end_line})")
+    emit([
+        f"{i:2d}. '{section.title}' (lines {section.start_line}-{section.end_line})"
+        for i, section in enumerate(sections, 1)
+    ])
     
     print()
     print("Header Hierarchy Issues:")
@@ -207,8 +214,7 @@ This is in a comment.
     
     issues = splitter._validate_header_hierarchy(edge_cases_doc)
     if issues:
-        for issue in issues:
-            print(f"   ⚠️  {issue}")
+        emit([f"   ⚠️  {issue}" for issue in issues])
     else:
         print("   ✅ No hierarchy issues detected")
     
@@ -244,22 +250,17 @@ def demo_unicode_handling():
         ("Emoji mix: 🎯📊📈💡", "Multiple emojis"),
     ]
     
-    # Create dummy splitter for anchor generation
-    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False)
-    temp_file.write("# Test")
-    temp_file.close()
-    
-    splitter = MarkdownSplitter(temp_file.name)
-    
+    out = []
     for i, (text, description) in enumerate(unicode_test_cases, 1):
-        anchor = splitter.create_toc_anchor(text)
-        kebab = splitter._to_kebab_case(text)
+        anchor = MarkdownSplitter.create_toc_anchor(text)
+        kebab = MarkdownSplitter._to_kebab_case(text)
         
-        print(f"{i:2d}. {description}")
-        print(f"    Original: '{text}'")
-        print(f"    Anchor:   '{anchor}'")
-        print(f"    Kebab:    '{kebab}'")
-        print()
+        out.append(f"{i:2d}. {description}")
+        out.append(f"    Original: '{text}'")
+        out.append(f"    Anchor:   '{anchor}'")
+        out.append(f"    Kebab:    '{kebab}'")
+        out.append("")
+    emit(out)
 
 
 def main():
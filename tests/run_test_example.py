@@ -7,6 +7,7 @@ and generates visible output for testing and demonstration purposes.
 """
 
 import os
+import re
 import sys
 import tempfile
 import shutil
@@ -16,6 +17,12 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from markdown_section_splitter import MarkdownSplitter
+from tests.demo_output import emit
+
+# Edge case detection in section titles: emojis (pictographs, dingbats and
+# miscellaneous symbols) and special characters
+EMOJI_PATTERN = re.compile("[\U0001F000-\U0001FFFF\u2600-\u27BF]")
+SPECIAL_CHAR_PATTERN = re.compile(r"[&$€%*\[\]()<>]")
 
 
 def run_splitter_test():
@@ -55,9 +62,10 @@ def run_splitter_test():
     print("-" * 20)
     
     generated_files = sorted(output_dir.glob("*"))
-    for i, file_path in enumerate(generated_files, 1):
-        size = file_path.stat().st_size
-        print(f"{i:2d}. {file_path.name:<35} ({size:,} bytes)")
+    emit([
+        f"{i:2d}. {file_path.name:<35} ({file_path.stat().st_size:,} bytes)"
+        for i, file_path in enumerate(generated_files, 1)
+    ])
     
     print()
     
@@ -66,8 +74,10 @@ def run_splitter_test():
     print("-" * 25)
     
     sections = splitter.sections
-    for i, section in enumerate(sections, 1):
-        print(f"{i:2d}. {section.filename:<35} → '{section.title}'")
+    emit([
+        f"{i:2d}. {section.filename:<35} → '{section.title}'"
+        for i, section in enumerate(sections, 1)
+    ])
     
     print()
     
@@ -75,8 +85,7 @@ def run_splitter_test():
     if splitter.broken_links:
         print("🔗 Broken Links Found:")
         print("-" * 23)
-        for link in splitter.broken_links:
-            print(f"   ⚠️  {link}")
+        emit([f"   ⚠️  {link}" for link in splitter.broken_links])
         print()
     
     # Show quality issues
@@ -85,8 +94,7 @@ def run_splitter_test():
     
     quality_issues = splitter.validate_split_quality()
     if quality_issues:
-        for issue in quality_issues:
-            print(f"   {issue}")
+        emit([f"   {issue}" for issue in quality_issues])
     else:
         print("   ✅ No quality issues found!")
     
@@ -102,11 +110,10 @@ def run_splitter_test():
         print(f"\n📑 {toc_file.name}:")
         print("   " + "─" * 40)
         with open(toc_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()[:15]  # First 15 lines
-            for line in lines:
-                print(f"   {line.rstrip()}")
-            if len(f.readlines()) > 15:
-                print(f"   ... ({len(lines)} more lines)")
+            lines = f.readlines()
+        emit([f"   {line.rstrip()}" for line in lines[:15]])  # First 15 lines
+        if len(lines) > 15:
+            print(f"   ... ({len(lines) - 15} more lines)")
     
     # Show first few section files
     section_files = sorted([f for f in generated_files if f.name.endswith('.md') and f.name != '00-toc.md'])[:3]
@@ -115,11 +122,10 @@ def run_splitter_test():
         print(f"\n📄 {section_file.name}:")
         print("   " + "─" * 40)
         with open(section_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()[:10]  # First 10 lines
-            for line in lines:
-                print(f"   {line.rstrip()}")
-            if len(f.readlines()) > 10:
-                print(f"   ... (more content)")
+            lines = f.readlines()
+        emit([f"   {line.rstrip()}" for line in lines[:10]])  # First 10 lines
+        if len(lines) > 10:
+            print(f"   ... (more content)")
     
     # Show anchor examples
     print(f"\n🔗 Anchor Generation Examples:")
@@ -134,9 +140,10 @@ def run_splitter_test():
         "$$ Costos y Pricing €€"
     ]
     
-    for example in anchor_examples:
-        anchor = splitter.create_toc_anchor(example)
-        print(f"   '{example}' → '{anchor}'")
+    emit([
+        f"   '{example}' → '{splitter.create_toc_anchor(example)}'"
+        for example in anchor_examples
+    ])
     
     print()
     print("🎯 TEST SUMMARY:")
@@ -164,18 +171,17 @@ def run_splitter_test():
         edge_cases.append(f"   🌍 Non-ASCII sections: {len(non_ascii_sections)}")
     
     # Check for emojis
-    emoji_sections = [s for s in sections if any(ord(c) > 127 and ord(c) < 0x1F000 or ord(c) > 0x1F999 for c in s.title)]
+    emoji_sections = [s for s in sections if EMOJI_PATTERN.search(s.title)]
     if emoji_sections:
         edge_cases.append(f"   😀 Sections with emojis: {len(emoji_sections)}")
     
     # Check for special characters
-    special_char_sections = [s for s in sections if any(c in s.title for c in '&$€%*[]()<>')]
+    special_char_sections = [s for s in sections if SPECIAL_CHAR_PATTERN.search(s.title)]
     if special_char_sections:
         edge_cases.append(f"   ⚡ Sections with special chars: {len(special_char_sections)}")
     
     if edge_cases:
-        for case in edge_cases:
-            print(case)
+        emit(edge_cases)
     else:
         print("   ✅ No specific edge cases detected")
     